@@ -1,170 +1,531 @@
+import hashlib
 import os
+import shutil
+from typing import Iterable, Iterator, Optional
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pcsv
+
+try:
+    from pandas.tseries.api import guess_datetime_format
+except ImportError:  # pandas < 2.2
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+
+# Translation table that deletes double quotes in a single pass over a string
+_QUOTE_TABLE = str.maketrans("", "", '"')
+
+# Bytes of the raw file parsed per chunk when streaming it through the pipeline
+BLOCK_SIZE = 16 << 20  # 16 MiB
+
+# Numeric columns
+NUMERIC_COLUMNS = ("price", "qty")
+
+# Storage dtype per numeric column. Prices stay float64 so cents survive at any
+# plausible amount; quantities are counts capped at 1e6, exact in float32.
+NUMERIC_DTYPES = {"price": np.float64, "qty": np.float32}
+
+def _normalize_column_name(name) -> str:
+    """
+    Return the standardized form of a column name (see clean_column_names).
+    """
+    return str(name).strip().lower().replace(" ", "_")
+
+def _raw_column_names(file_path: str) -> dict:
+    """
+    Map standardized column names to the raw header names of a CSV file.
+
+    Only the header line is read.
+    """
+    header = pd.read_csv(file_path, nrows=0).columns
+    return {_normalize_column_name(c): c for c in header}
+
+def _read_csv_options(file_path: str) -> dict:
+    """
+    Build pd.read_csv keyword arguments for the raw file.
+
+    Options are keyed on the file's raw column names so the parser can parse 'date_sold'
+    while it parses. Clean numeric and date columns then arrive typed, with no later
+    conversion pass. This only applies to load_data; see load_data_chunks for the
+    chunked path used by main. Every column is kept: columns the pipeline does not clean still
+    end up in the output and count when comparing rows for duplicates. The raw
+    export's '-' placeholder for a missing number is left to _coerce_numeric: the
+    pyarrow engine only takes a flat list of NA markers, which would also blank a
+    literal '-' in the text columns.
+    """
+    raw_names = _raw_column_names(file_path)
+    parse_dates = [raw_names["date_sold"]] if "date_sold" in raw_names else None
+    return {
+        "engine": "pyarrow",
+        "dtype_backend": "pyarrow",
+        "parse_dates": parse_dates,
+    }
+
+def _coerce_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Coerce 'price' and 'qty' to numeric unless they already parsed as numbers, and store
+    them as NumPy floats (see NUMERIC_DTYPES) with NaN as the only missing marker.
+
+    The raw export's '-' placeholder for a missing number, like any other non-numeric
+    value, becomes NaN in the to_numeric(errors="coerce") parse itself. Arrow-backed
+    results can hold both NaN and NA (and fillna only fills NA), so the columns are always
+    normalized to NumPy floats.
+    """
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            if not pd.api.types.is_numeric_dtype(df[col]):
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+            if df[col].dtype != NUMERIC_DTYPES[col]:
+                df[col] = pd.Series(
+                    df[col].to_numpy(dtype=NUMERIC_DTYPES[col], na_value=np.nan),
+                    index=df.index,
+                    name=col,
+                )
+    return df
 
 def load_data(file_path: str) -> pd.DataFrame:
     """
     Load the raw sales CSV file into a pandas DataFrame.
 
+    The file is parsed with the multi-threaded PyArrow engine into Arrow-backed columns.
+
     file_path: path to the CSV file (can be absolute or relative).
     """
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Could not find raw data file: {file_path}")
-    df = pd.read_csv(file_path)
+    df = pd.read_csv(file_path, **_read_csv_options(file_path))
     return df
 
+def load_data_chunks(file_path: str, block_size: int = BLOCK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Lazily load the raw sales CSV file as a sequence of DataFrame chunks.
+
+    The file is streamed with PyArrow's CSV reader, which parses the next block on a
+    background thread while the current chunk is being cleaned and keeps only about one
+    block in memory. As in load_data, every column is kept.
+
+    The reader would infer every column's type from the first block alone and then fail
+    on any later value that does not fit (a first decimal price, a bad date, a value in a
+    column that started out empty). So every column is read as text, and price/qty and
+    date_sold are coerced per chunk by handle_missing_values just as unparseable ones are
+    on the load_data path. So no date or number is parsed at read time here: date_sold
+    is converted by pd.to_datetime in each chunk (in main, once in the planning pass and
+    again in the cleaning pass), as a typed read would abort on the first invalid
+    date instead of coercing it. Other columns stay text, so unlike load_data, an extra
+    numeric column is imputed with its mode rather than its median.
+
+    file_path: path to the CSV file (can be absolute or relative).
+    block_size: approximate number of bytes of the file per chunk.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Could not find raw data file: {file_path}")
+    header = pd.read_csv(file_path, nrows=0).columns
+    convert_options = pcsv.ConvertOptions(
+        column_types={c: pa.string() for c in header},
+        strings_can_be_null=True,
+    )
+    read_options = pcsv.ReadOptions(block_size=block_size)
+    with pcsv.open_csv(file_path, read_options=read_options, convert_options=convert_options) as reader:
+        for batch in reader:
+            yield batch.to_pandas(types_mapper=pd.ArrowDtype)
+
 def clean_column_names(df: pd.DataFrame) -> pd.DataFrame:
     """
     Standardize column names:
     - strip whitespace
     - lowercase
     - replace spaces with underscores
+
+    The columns are renamed in place; the same DataFrame is returned.
     """
-    df = df.copy()
-    df.columns = (
-        df.columns
-        .astype(str)
-        .str.strip()
-        .str.lower()
-        .str.replace(" ", "_", regex=False)
-    )
+    df.columns = [_normalize_column_name(c) for c in df.columns]
     return df
 
+def _clean_text(s: pd.Series) -> pd.Series:
+    """
+    Remove double quotes and surrounding whitespace from a single text column.
+
+    The result is always a PyArrow-backed string column; non-string values (e.g. a
+    stray number) become their string form and missing values stay missing.
+    """
+    if s.dtype == object:
+        # Only hand-built object frames take this path: both loaders (and pandas 3's
+        # default str dtype) produce string columns. On object columns plain str
+        # methods beat the .str accessor, which adds NA handling overhead per element
+        values = s.to_numpy()
+        return pd.Series(
+            [
+                None if not isinstance(v, str) and pd.isna(v)
+                else str(v).translate(_QUOTE_TABLE).strip()
+                for v in values
+            ],
+            index=s.index,
+            name=s.name,
+            dtype="string[pyarrow]",
+        )
+    return s.astype("string[pyarrow]").str.replace('"', "", regex=False).str.strip()
+
 def strip_whitespace(df: pd.DataFrame) -> pd.DataFrame:
     """
-    Strip leading/trailing whitespace from common text columns if they exist.
+    Strip leading/trailing whitespace and stray double quotes from common text
+    columns if they exist.
+
+    The columns come out as PyArrow-backed strings, so the string operations run as
+    Arrow compute kernels instead of per-element Python calls (object columns in
+    hand-built frames are cleaned with a list comprehension over the raw values).
+    The columns are updated in place; the same DataFrame is returned.
+    """
+    text_cols = [c for c in ("prodname", "category") if c in df.columns]
+    if text_cols:
+        # Clean all text columns in one apply and assign them back together
+        df[text_cols] = df[text_cols].apply(_clean_text)
+    return df
+
+def categorize_text(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Store the repetitive text columns ('prodname', 'category') as pandas categoricals.
+
+    Sales data repeats a small set of product and category names, so each column
+    becomes small integer codes plus one copy of each distinct string: much less memory,
+    and row hashing for deduplication works on the codes. Run this after
+    handle_missing_values so mode imputation still sees plain string columns.
+    The columns are updated in place; the same DataFrame is returned.
     """
-    df = df.copy()
     for col in ("prodname", "category"):
         if col in df.columns:
-            df[col] = df[col].astype("string").str.strip()
+            df[col] = df[col].astype("category")
     return df
 
-def handle_missing_values(df: pd.DataFrame) -> pd.DataFrame:
+def _date_format(dates: pd.Series) -> Optional[str]:
+    """
+    Choose the format to parse a text date column with, from its first value.
+
+    ISO-style dates use pandas' "ISO8601" format, which also accepts the same dates
+    with a time of day; anything unrecognisable is parsed value by value ("mixed").
+    Returns None while the column holds no values yet.
+    """
+    values = dates.dropna()
+    if values.empty:
+        return None
+    fmt = guess_datetime_format(str(values.iloc[0]))
+    if fmt is None:
+        return "mixed"
+    if fmt.startswith("%Y-%m-%d"):
+        return "ISO8601"
+    return fmt
+
+def _coerce_types(df: pd.DataFrame, date_format: Optional[str] = None) -> pd.DataFrame:
+    """
+    Coerce 'price'/'qty' to numbers and 'date_sold' to datetime (errors -> NaN/NaT).
+
+    date_format: format for a text 'date_sold' column (see _date_format). When cleaning
+    a file chunk by chunk, pass the format chosen for the whole file so a chunk whose
+    first date looks different does not turn the other dates into NaT; by default it is
+    chosen from df itself.
+    """
+    df = _coerce_numeric(df)
+    if "date_sold" in df.columns and not pd.api.types.is_datetime64_any_dtype(df["date_sold"]):
+        # load_data parses clean dates already; chunks from load_data_chunks and files
+        # with unparseable dates arrive as text
+        df["date_sold"] = pd.to_datetime(
+            df["date_sold"],
+            format=date_format or _date_format(df["date_sold"]),
+            errors="coerce",
+        )
+    return df
+
+def _median_from_counts(counts: pd.Series) -> float:
+    """
+    Return the median of the values described by a value -> count Series.
+    """
+    counts = counts.sort_index()
+    positions = counts.cumsum().to_numpy()
+    total = positions[-1]
+    # Values at the two middle positions (the same one when total is odd)
+    lower = counts.index[np.searchsorted(positions, (total - 1) // 2, side="right")]
+    upper = counts.index[np.searchsorted(positions, total // 2, side="right")]
+    return float((lower + upper) / 2)
+
+def missing_value_plan(frames: Iterable[pd.DataFrame]) -> dict:
+    """
+    Decide how handle_missing_values treats each column, looking at all of the data.
+
+    frames: the data as it reaches handle_missing_values, either one DataFrame in a list
+    or every chunk of a file (e.g. a generator, so only one chunk is in memory).
+
+    Returns a dict with:
+    - "date_format": the format text 'date_sold' values are parsed with, chosen from the
+      first date in the data (None if there is none).
+    - "drop": columns with more than 50% missing values.
+    - "whole_days": datetime column -> whether it holds only whole days, so _write_csv
+      can format it the same way in every chunk.
+    - "fill": the value to fill missing entries with in each remaining column: the median
+      for numeric columns (0 if the column is entirely missing), False for boolean
+      columns, and the mode for object/string columns ('Unknown' if there is none).
+
+    Medians and modes are computed from per-frame value counts, combined once at the end,
+    so chunked data gets exactly the same plan as the whole file would. Columns with no
+    missing values get no fill value, since there is nothing to fill.
+    """
+    rows = 0
+    missing = {}
+    kinds = {}
+    counts = {}
+    whole_days = {}
+    date_format = None
+    for df in frames:
+        if (
+            date_format is None
+            and "date_sold" in df.columns
+            and not pd.api.types.is_datetime64_any_dtype(df["date_sold"])
+        ):
+            date_format = _date_format(df["date_sold"])
+        df = _coerce_types(df, date_format)
+        rows += len(df)
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                whole_days[col] = whole_days.get(col, True) and _is_whole_days(df[col])
+        for col, n in df.isna().sum().items():
+            missing[col] = missing.get(col, 0) + n
+        for kind, include in (("number", ["number"]), ("bool", ["bool"]), ("text", ["object", "string"])):
+            for col in df.select_dtypes(include=include).columns:
+                if kinds.get(col) != "unhashable":
+                    kinds[col] = kind
+        for col, kind in kinds.items():
+            if kind in ("bool", "unhashable") or col not in df.columns:
+                continue
+            try:
+                col_counts = df[col].value_counts(dropna=True)
+            except TypeError:
+                # Unhashable values (e.g. lists) cannot be counted; fall back to 'Unknown'
+                kinds[col] = "unhashable"
+                continue
+            counts.setdefault(col, []).append(col_counts)
+
+    # Drop columns with a high missing rate (>50%)
+    thresh = 0.5
+    drop = [c for c, n in missing.items() if rows and n / rows > thresh]
+
+    fill = {}
+    for col, kind in kinds.items():
+        if col in drop or not missing.get(col):
+            continue
+        col_counts = counts.get(col)
+        if col_counts:
+            # One combined value -> count Series, sorted by value
+            col_counts = pd.concat(col_counts).groupby(level=0).sum()
+        has_values = col_counts is not None and len(col_counts) > 0
+        if kind == "number":
+            # If the entire column is NaN there is no median; fill with 0
+            fill[col] = _median_from_counts(col_counts) if has_values else 0
+        elif kind == "bool":
+            fill[col] = False
+        elif kind == "text" and has_values:
+            # Most frequent value; ties go to the smallest, as with Series.mode
+            fill[col] = col_counts[col_counts == col_counts.max()].sort_index().index[0]
+        else:
+            fill[col] = "Unknown"
+    return {"date_format": date_format, "drop": drop, "fill": fill, "whole_days": whole_days}
+
+def handle_missing_values(df: pd.DataFrame, plan: Optional[dict] = None) -> pd.DataFrame:
     """
     Handle missing and invalid values with a sensible default strategy:
 
-    - Convert 'price' and 'qty' to numeric (coerce errors -> NaN).
-    - Convert 'date_sold' to datetime (coerce errors -> NaT).
+    - Convert 'price' and 'qty' to float numbers (coerce errors -> NaN).
+    - Convert 'date_sold' to datetime (coerce errors -> NaT) if it was not parsed on load.
     - Drop columns with more than 50% missing values.
     - For numeric columns: fill missing with the column median.
     - For categorical (object/string) columns: fill missing with the mode when available, otherwise 'Unknown'.
     - For boolean columns: fill missing with False.
-    - After imputation, drop any remaining rows missing any of the required columns ('price', 'qty', 'date_sold') if those columns exist.
 
-    This function returns a cleaned copy of the DataFrame.
-    """
-    df = df.copy()
+    plan: the columns to drop and fill values to use, from missing_value_plan. When
+    cleaning a file chunk by chunk, pass the plan computed over the whole file so every
+    chunk is treated alike; by default it is computed from df itself.
 
+    Rows still missing a required value ('price', 'qty', 'date_sold') are left for
+    filter_rows, which drops them in the same pass as the other row checks.
+
+    Columns of the passed DataFrame are converted and imputed in place; dropping
+    columns or rows returns a new DataFrame, so always use the return value.
+    """
     # Coerce common columns to proper dtypes
-    if "price" in df.columns:
-        df["price"] = pd.to_numeric(df["price"], errors="coerce")
-    if "qty" in df.columns:
-        df["qty"] = pd.to_numeric(df["qty"], errors="coerce")
-    if "date_sold" in df.columns:
-        df["date_sold"] = pd.to_datetime(df["date_sold"], errors="coerce")
+    df = _coerce_types(df, plan["date_format"] if plan else None)
+    if plan is None:
+        plan = missing_value_plan([df])
 
-    # Drop columns with a high missing rate (>50%)
-    thresh = 0.5
-    missing_frac = df.isna().mean()
-    cols_to_drop = missing_frac[missing_frac > thresh].index.tolist()
+    cols_to_drop = [c for c in plan["drop"] if c in df.columns]
     if cols_to_drop:
         df = df.drop(columns=cols_to_drop)
 
-    # Impute numeric columns with median
-    num_cols = df.select_dtypes(include=["number"]).columns.tolist()
-    for col in num_cols:
-        median = df[col].median()
-        if pd.isna(median):
-            # If entire column is NaN (median NaN), fill with 0
-            df[col] = df[col].fillna(0)
-        else:
-            df[col] = df[col].fillna(median)
-
-    # Impute boolean columns
-    bool_cols = df.select_dtypes(include=["bool"]).columns.tolist()
-    for col in bool_cols:
-        df[col] = df[col].fillna(False)
-
-    # Impute object/string columns with mode or 'Unknown'
-    obj_cols = df.select_dtypes(include=["object", "string"]).columns.tolist()
-    for col in obj_cols:
-        if df[col].isna().all():
-            df[col] = df[col].fillna("Unknown")
-            continue
-        try:
-            mode = df[col].mode(dropna=True)
-            if not mode.empty:
-                df[col] = df[col].fillna(mode.iloc[0])
-            else:
-                df[col] = df[col].fillna("Unknown")
-        except Exception:
-            df[col] = df[col].fillna("Unknown")
-
-    # Finally, ensure required columns do not contain missing values; drop rows if they do
-    required = [c for c in ("price", "qty", "date_sold") if c in df.columns]
-    if required:
-        df = df.dropna(subset=required)
+    for col, value in plan["fill"].items():
+        if col in df.columns:
+            df[col] = df[col].fillna(value)
 
     return df
 
-def remove_invalid_rows(df: pd.DataFrame) -> pd.DataFrame:
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    """
+    Return one uint64 hash per row of df, over all of its columns.
+
+    Numeric columns are hashed as float64, so a row hashes the same whether its chunk
+    kept 'qty' as floats or converted it to Int32.
+    """
+    numeric = df.select_dtypes(include="number").columns
+    if len(numeric):
+        df = df.astype({col: np.float64 for col in numeric})
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+def _unseen(hashes: np.ndarray, seen: list) -> np.ndarray:
     """
-    Remove rows with invalid or implausible numeric values and duplicates.
+    Return a mask of the row hashes not in seen, and add those hashes to seen.
+
+    seen: sorted uint64 arrays of the hashes kept so far, largest first; start with [].
+    A new array is merged into the one before it while that one is no larger, so seen
+    holds only O(log n) arrays to search and takes 8 bytes per kept row.
+    """
+    mask = np.ones(len(hashes), dtype=bool)
+    for level in seen:
+        pos = np.minimum(np.searchsorted(level, hashes), len(level) - 1)
+        mask &= level[pos] != hashes
+    new = np.sort(hashes[mask])
+    if len(new):
+        seen.append(new)
+        while len(seen) > 1 and len(seen[-2]) <= len(seen[-1]):
+            newer = seen.pop()
+            seen[-1] = np.sort(np.concatenate([seen[-1], newer]), kind="stable")
+    return mask
+
+def filter_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Remove rows with missing, invalid or implausible values and duplicates.
 
     Steps performed:
-    - Coerce 'price' and 'qty' to numeric (errors -> NaN).
-    - Drop rows with NaN in required numeric columns (price, qty) if they exist.
-    - Remove rows with negative price or negative quantity (price < 0 or qty < 0).
-    - Remove rows with implausibly large values (safeguard thresholds applied).
+    - Coerce 'price' and 'qty' to float numbers (errors -> NaN).
+    - In one combined filter, drop rows where date_sold is missing, or where price or
+      qty is missing, negative (price < 0 or qty < 0) or implausibly large (safeguard
+      thresholds applied). Each check only applies if its column exists.
     - Convert 'qty' to integer nullable dtype when values are whole numbers.
-    - Drop exact duplicate rows.
+    - Drop exact duplicate rows (compared via a per-row hash). Only rows within df are
+      compared; main drops duplicates of rows written from earlier chunks.
 
     The thresholds used for implausible values are conservative defaults and can be adjusted
     later if you want different behavior.
     """
-    df = df.copy()
-
     # Coerce to numeric for checks
-    if "price" in df.columns:
-        df["price"] = pd.to_numeric(df["price"], errors="coerce")
-    if "qty" in df.columns:
-        df["qty"] = pd.to_numeric(df["qty"], errors="coerce")
-
-    # Drop rows where required numeric columns are missing
-    required_numeric = [c for c in ("price", "qty") if c in df.columns]
-    if required_numeric:
-        df = df.dropna(subset=required_numeric)
-
-    # Remove negative values
-    if "price" in df.columns:
-        df = df[df["price"] >= 0]
-    if "qty" in df.columns:
-        df = df[df["qty"] >= 0]
-
-    # Remove implausibly large values (safeguards)
-    # These thresholds are intentionally high to avoid dropping valid outliers in normal datasets
-    if "price" in df.columns:
-        max_price = 1e7  # $10 million
-        df = df[df["price"] <= max_price]
-    if "qty" in df.columns:
-        max_qty = 1e6  # 1 million units
-        df = df[df["qty"] <= max_qty]
+    df = _coerce_numeric(df)
+
+    # Build one keep-mask over the required columns and filter the frame once: a row
+    # survives only if it has a date and its price/qty are present (NaN fails every
+    # comparison), non-negative and not implausibly large. The thresholds are
+    # intentionally high to avoid dropping valid outliers in normal datasets
+    max_values = {
+        "price": 1e7,  # $10 million
+        "qty": 1e6,  # 1 million units
+    }
+    keep = np.ones(len(df), dtype=bool)
+    if "date_sold" in df.columns:
+        keep &= df["date_sold"].notna().to_numpy()
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            values = df[col].to_numpy()
+            keep &= (values >= 0) & (values <= max_values[col])
+    df = df[keep]
 
     # If qty values are all whole numbers, convert to nullable integer dtype
     if "qty" in df.columns and not df["qty"].empty:
         try:
             # Check for whole numbers (allowing for float dtype)
             if (df["qty"].dropna() % 1 == 0).all():
-                df["qty"] = df["qty"].astype("Int64")
+                df["qty"] = df["qty"].astype("Int32")
         except Exception:
             # If modulo operation fails for some reason, skip conversion
             pass
 
-    # Drop exact duplicate rows
-    df = df.drop_duplicates()
+    # Drop exact duplicate rows: fingerprint each row as one 64-bit hash over all of its
+    # columns, then deduplicate on that single integer column
+    row_hashes = pd.Series(_row_hashes(df))
+    df = df[~row_hashes.duplicated().to_numpy()]
 
     return df
 
+def _cache_key(file_path: str) -> str:
+    """
+    Return a SHA-256 key for the cleaned output of file_path.
+
+    The key covers the raw file's bytes and this script's source, so editing either
+    one invalidates previously cached results.
+    """
+    key = hashlib.sha256()
+    for path in (file_path, os.path.abspath(__file__)):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        key.update(digest.digest())
+    return key.hexdigest()
+
+def _is_whole_days(values) -> bool:
+    """
+    Return whether a datetime column (pandas Series or Arrow array) holds only whole days.
+
+    Missing values are ignored; date columns trivially qualify.
+    """
+    values = values if isinstance(values, (pa.Array, pa.ChunkedArray)) else pa.array(values)
+    if not pa.types.is_timestamp(values.type):
+        return True
+    return pc.all(pc.equal(pc.floor_temporal(values, unit="day"), values)).as_py() is not False
+
+def _write_csv(
+    df: pd.DataFrame, sink, include_header: bool = True, whole_days: Optional[dict] = None
+) -> None:
+    """
+    Write a DataFrame as CSV with PyArrow's multi-threaded C++ writer.
+
+    sink: output path or binary file object (pass an open file to append several chunks).
+    whole_days: column -> whether that timestamp column holds only whole days in the
+    whole file (see missing_value_plan). Pass it when writing chunks so a column is
+    formatted the same way in every chunk; columns not listed are checked in df itself.
+
+    Text values are always quoted. As with DataFrame.to_csv, timestamp columns holding
+    whole days are written as plain dates.
+    """
+    whole_days = whole_days or {}
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, col in enumerate(table.columns):
+        name = table.field(i).name
+        if not pa.types.is_timestamp(col.type):
+            continue
+        if whole_days[name] if name in whole_days else _is_whole_days(col):
+            table = table.set_column(i, name, pc.cast(col, pa.date32()))
+    pcsv.write_csv(table, sink, write_options=pcsv.WriteOptions(include_header=include_header))
+
+def _prepare(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Run the pipeline stages that come before handle_missing_values.
+    """
+    df = clean_column_names(df)
+    df = strip_whitespace(df)
+    return df
+
+def clean_data(df: pd.DataFrame, plan: Optional[dict] = None) -> pd.DataFrame:
+    """
+    Run the full cleaning pipeline on a DataFrame (or a single chunk of one).
+
+    plan: missing-value plan passed on to handle_missing_values. For a chunk, pass
+    the plan for the whole file (see main) so columns and fill values do not depend
+    on where the chunk boundaries fall. Duplicate rows are only removed within df;
+    main also drops rows that duplicate one from an earlier chunk.
+
+    The stages modify their input instead of copying it, so pass a DataFrame the
+    caller owns (such as a freshly loaded one), or a copy of it.
+    """
+    df = _prepare(df)
+    df = handle_missing_values(df, plan)
+    df = categorize_text(df)
+    df = filter_rows(df)
+    return df
+
 def main():
     # Build paths relative to the repository root (parent of src/)
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -173,15 +534,51 @@ def main():
     cleaned_path = os.path.join(repo_root, "data", "processed", "sales_data_clean.csv")
 
     print("Using raw_path:", raw_path)
-    
-        if __name__ == "__main__":
-        raw_path = "data/raw/sales_data_raw.csv"
-        cleaned_path = "data/processed/sales_data_clean.csv"
-
-        df_raw = load_data(raw_path)
-        df_clean = clean_column_names(df_raw)
-        df_clean = handle_missing_values(df_clean)
-        df_clean = remove_invalid_rows(df_clean)
-        df_clean.to_csv(cleaned_path, index=False)
-        print("Cleaning complete. First few rows:")
-        print(df_clean.head())
+
+    # The cleaning stages assign columns on the frame they are given instead of copying
+    # it first. Copy-on-Write lets those assignments share buffers rather than
+    # materializing defensive copies. It is always on from pandas 3.0, where the option
+    # is deprecated; it is set here rather than at import so importing this module
+    # leaves pandas settings untouched
+    if int(pd.__version__.split(".")[0]) < 3:
+        pd.set_option("mode.copy_on_write", True)
+
+    # Reuse the previous result when neither the raw file nor this script has changed
+    if not os.path.exists(raw_path):
+        raise FileNotFoundError(f"Could not find raw data file: {raw_path}")
+    cache_dir = os.path.join(repo_root, "data", "processed", ".cache")
+    cache_path = os.path.join(cache_dir, f"{_cache_key(raw_path)}.csv")
+    if os.path.exists(cache_path):
+        shutil.copyfile(cache_path, cleaned_path)
+        print("Raw data unchanged, reused cached result. First few rows:")
+        print(pd.read_csv(cleaned_path, nrows=5))
+        return
+
+    # Clean the file chunk by chunk and append each result to the output,
+    # so peak memory stays at roughly one chunk regardless of input size.
+    # A first pass over the file decides which columns to drop and what to fill
+    # missing values with, so every chunk gets the same columns and values.
+    # The hashes of rows already written are kept to drop duplicates across chunks
+    plan = missing_value_plan(_prepare(chunk) for chunk in load_data_chunks(raw_path))
+    preview = None
+    seen = []
+    with open(cleaned_path, "wb") as out:
+        for chunk in load_data_chunks(raw_path):
+            df_clean = clean_data(chunk, plan)
+            df_clean = df_clean[_unseen(_row_hashes(df_clean), seen)]
+            _write_csv(df_clean, out, include_header=preview is None, whole_days=plan["whole_days"])
+            if preview is None:
+                preview = df_clean.head()
+
+    # Keep only the latest result so the cache holds at most one copy of the output
+    os.makedirs(cache_dir, exist_ok=True)
+    for name in os.listdir(cache_dir):
+        if name.endswith(".csv"):
+            os.remove(os.path.join(cache_dir, name))
+    shutil.copyfile(cleaned_path, cache_path)
+
+    print("Cleaning complete. First few rows:")
+    print(preview)
+
+if __name__ == "__main__":
+    main()
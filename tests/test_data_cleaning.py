@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import data_cleaning as dc
+
+
+def sample_frame():
+    return pd.DataFrame({
+        "prodname": ["A", "B", "C", "D", "E", "F", "G", "H"],
+        "category": ["b", "b", "a", None, "a", "c", None, "c"],
+        "price": [1.0, 2.0, 3.0, np.nan, 10.0, 20.0, 30.0, np.nan],
+        "qty": [1.0, np.nan, 1.0, 1.0, 5.0, 5.0, 5.0, 5.0],
+        "date_sold": ["2024-01-01"] * 8,
+        "notes": [None] * 7 + ["x"],
+    })
+
+
+def test_split_frame_matches_whole_frame():
+    df = sample_frame()
+    parts = [df.iloc[:4].copy(), df.iloc[4:].copy()]
+    plan = dc.missing_value_plan(part.copy() for part in parts)
+
+    whole = dc.handle_missing_values(df.copy())
+    split = pd.concat([dc.handle_missing_values(part, plan) for part in parts])
+
+    pd.testing.assert_frame_equal(split, whole)
+    assert "notes" not in whole.columns
+    assert whole["price"].tolist() == [1.0, 2.0, 3.0, 6.5, 10.0, 20.0, 30.0, 6.5]
+    assert whole["qty"].tolist() == [1.0, 5.0, 1.0, 1.0, 5.0, 5.0, 5.0, 5.0]
+
+
+def test_median_from_counts_odd_total():
+    counts = pd.Series([1, 1, 1], index=[10.0, 1.0, 3.0])
+    assert dc._median_from_counts(counts) == 3.0
+
+
+def test_median_from_counts_even_total():
+    counts = pd.Series([2, 1, 1], index=[10.0, 1.0, 3.0])
+    assert dc._median_from_counts(counts) == 6.5
+
+
+def test_mode_tie_goes_to_smallest_value():
+    # 'b' leads in the first frame, but 'a' and 'c' tie with it over both frames
+    plan = dc.missing_value_plan([
+        pd.DataFrame({"category": ["b", "b", "a", None]}),
+        pd.DataFrame({"category": ["a", "c", "c", "d"]}),
+    ])
+    assert plan["fill"]["category"] == "a"
+
+
+def test_all_missing_columns_are_dropped():
+    df = pd.DataFrame({
+        "prodname": ["A", "B", "C"],
+        "price": [np.nan] * 3,
+        "category": [None] * 3,
+        "qty": [1.0, 2.0, 3.0],
+    })
+    plan = dc.missing_value_plan([df.copy()])
+    assert sorted(plan["drop"]) == ["category", "price"]
+    assert plan["fill"] == {}
+    assert dc.handle_missing_values(df).columns.tolist() == ["prodname", "qty"]